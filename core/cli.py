@@ -6,11 +6,8 @@
 import typer
 from rich.console import Console
 
-from core.loader import load_feedback
-from core.stats import compute_basic_stats, sample_feedback_texts
-from core.guards import sanitize_samples, guard_rails_summary
-from core.llm import generate_ai_insights
-from core.report import write_markdown_report
+# Pipeline modules (pandas, openai) are imported inside analyze() so that
+# `--help` and command discovery do not pay their import cost.
 
 app = typer.Typer(add_completion=False)
 console = Console()
@@ -23,12 +20,20 @@ def analyze(
     rating_col: str = "rating",
     date_col: str = "date",
     sample_size: int = 200,
+    cache: bool = typer.Option(True, help="Reuse cached AI insights for identical input."),
 ):
     """
     Analyze customer feedback and generate a Markdown report.
     """
+    from core.loader import load_feedback
+    from core.stats import compute_basic_stats, sample_feedback_texts
+    from core.guards import sanitize_samples, guard_rails_summary
+    from core.llm import generate_ai_insights
+    from core.report import write_markdown_report
+
     console.print(f"[bold]Reading:[/bold] {csv_path}")
-    df = load_feedback(csv_path)
+    # Only parse the columns the pipeline actually uses
+    df = load_feedback(csv_path, columns=[text_col, rating_col, date_col])
 
     # Compute KPIs: total responses, average rating (if present)
     stats = compute_basic_stats(df, rating_col=rating_col)
@@ -52,7 +57,7 @@ def analyze(
     guards_note = guard_rails_summary(warnings)
 
     console.print("[bold]Requesting AI insights…[/bold]")
-    ai = generate_ai_insights(texts, stats)
+    ai = generate_ai_insights(texts, stats, use_cache=cache)
 
     # Render a Markdown report
     write_markdown_report(out_path, stats, ai, guards_note=guards_note)
@@ -26,10 +26,18 @@ SUSPECT_PATTERNS = [
     r"(?i)\b<<.*system.*>>",      # bracketed pseudo-system blocks
 ]
 
-CONTROL_CHARS = re.compile(r"[\x00-\x08\x0B-\x1F\x7F]")
+# Compiled once at import; keep the raw pattern for the warning message
+_SUSPECT_COMPILED = [(pat, re.compile(pat)) for pat in SUSPECT_PATTERNS]
+
+# Role markers that try to impersonate system/assistant/user, redacted in one pass
+_ROLE_MARKER = re.compile(r"(?i)\b(system|assistant|user):\b")
+
+# Control chars + DEL (tab and newline are kept), dropped via str.translate
+_CTRL_CODES = list(range(0x00, 0x09)) + list(range(0x0B, 0x20)) + [0x7F]
+_CTRL_TRANSLATE = str.maketrans("", "", "".join(chr(c) for c in _CTRL_CODES))
 
 def _strip_control_chars(text: str) -> str:
-    return CONTROL_CHARS.sub("", text)
+    return text.translate(_CTRL_TRANSLATE)
 
 def _truncate(text: str, limit: int) -> str:
     if len(text) <= limit:
@@ -38,15 +46,12 @@ def _truncate(text: str, limit: int) -> str:
 
 def _neutralize_injection_markers(text: str) -> str:
     # Replace likely role markers that try to impersonate system/assistant
-    text = re.sub(r"(?i)\bsystem:\b", "[role-redacted:system]", text)
-    text = re.sub(r"(?i)\bassistant:\b", "[role-redacted:assistant]", text)
-    text = re.sub(r"(?i)\buser:\b", "[role-redacted:user]", text)
-    return text
+    return _ROLE_MARKER.sub(lambda m: f"[role-redacted:{m.group(1).lower()}]", text)
 
 def _detect_suspicious(text: str) -> List[str]:
     warnings = []
-    for pat in SUSPECT_PATTERNS:
-        if re.search(pat, text):
+    for pat, cre in _SUSPECT_COMPILED:
+        if cre.search(text):
             warnings.append(f"Suspicious pattern matched: /{pat}/")
     return warnings
 
@@ -57,32 +62,32 @@ def sanitize_samples(samples: List[str]) -> Tuple[List[str], List[str]]:
     - Strips control chars
     - Truncates long samples
     - Neutralizes role markers
-    - Aggregates warnings for transparency
+    - Aggregates warnings for transparency (each distinct warning once)
     """
     warnings: List[str] = []
     if len(samples) > MAX_SAMPLES:
         warnings.append(f"Sample count capped: {len(samples)} -> {MAX_SAMPLES}")
 
+    seen = set(warnings)
     clean: List[str] = []
-    for i, s in enumerate(samples[:MAX_SAMPLES]):
-        original = s
-        s = _strip_control_chars(s)
-        s = _truncate(s, MAX_CHARS_PER_SAMPLE)
-        s = _neutralize_injection_markers(s)
+    for s in samples[:MAX_SAMPLES]:
+        # Cap first so every later pass touches at most MAX_CHARS_PER_SAMPLE chars
+        s = _truncate(_strip_control_chars(s), MAX_CHARS_PER_SAMPLE)
 
-        # collect warnings if suspicious
-        ws = _detect_suspicious(original)
-        warnings.extend(ws)
+        # collect warnings if suspicious (before role markers get redacted)
+        for w in _detect_suspicious(s):
+            if w not in seen:
+                seen.add(w)
+                warnings.append(w)
 
-        clean.append(s)
+        clean.append(_neutralize_injection_markers(s))
 
     return clean, warnings
 
 def guard_rails_summary(warnings: List[str]) -> str:
     if not warnings:
         return "Guard rails: OK (no suspicious patterns detected)."
-    # Keep it short for the report footer
-    uniq = list(dict.fromkeys(warnings))  # de-dup while preserving order
-    trimmed = uniq[:8]
-    more = f" (+{len(uniq)-8} more)" if len(uniq) > 8 else ""
+    # Keep it short for the report footer (sanitize_samples already de-dups)
+    trimmed = warnings[:8]
+    more = f" (+{len(warnings)-8} more)" if len(warnings) > 8 else ""
     return "Guard rails warnings: " + "; ".join(trimmed) + more
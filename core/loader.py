@@ -1,17 +1,43 @@
 # core/loader.py
 # Safe CSV loading with column normalization and minimum schema checks.
 
+import importlib.util
+from typing import Iterable, Optional
+
 import pandas as pd
 
+# Optional: pyarrow parses faster and stores text columns far more compactly
+_HAS_PYARROW = importlib.util.find_spec("pyarrow") is not None
+
 REQUIRED_COLUMNS = {"feedback"}  # Minimum column we need
+CHUNK_SIZE = 200_000  # rows per read_csv chunk (C engine); bounds parser memory
+
+def _normalize(name) -> str:
+    return str(name).strip().lower()
 
-def load_feedback(path: str) -> pd.DataFrame:
+def load_feedback(path: str, columns: Optional[Iterable[str]] = None) -> pd.DataFrame:
     """
     Loads the CSV, normalizes column names (lowercase + trimmed),
     and ensures required columns exist.
+    If columns is given, only those (plus the required ones) are parsed;
+    absent optional columns are skipped.
     """
-    df = pd.read_csv(path)
-    df.columns = [c.strip().lower() for c in df.columns]
-    if not REQUIRED_COLUMNS.issubset(set(df.columns)):
+    # Cheap header probe: normalize names once and validate before parsing rows
+    header = pd.read_csv(path, nrows=0).columns
+    names = [_normalize(c) for c in header]
+    if not REQUIRED_COLUMNS.issubset(set(names)):
         raise ValueError(f"CSV is missing required column(s): {REQUIRED_COLUMNS}")
+
+    usecols = None
+    if columns is not None:
+        wanted = REQUIRED_COLUMNS | {_normalize(c) for c in columns}
+        usecols = [orig for orig, norm in zip(header, names) if norm in wanted]
+
+    if _HAS_PYARROW:
+        # Arrow-backed dtypes; the pyarrow engine has no chunksize support
+        df = pd.read_csv(path, usecols=usecols, engine="pyarrow", dtype_backend="pyarrow")
+    else:
+        chunks = pd.read_csv(path, usecols=usecols, chunksize=CHUNK_SIZE)
+        df = pd.concat(chunks, ignore_index=True)
+    df.columns = [_normalize(c) for c in df.columns]
     return df
@@ -21,27 +21,30 @@ def write_markdown_report(out_path: str, stats: Dict, ai: Dict, guards_note: str
       - Guard-rail notes (transparency)
     """
     ts = datetime.now().strftime("%Y-%m-%d %H:%M")
-    md = HEADER.format(timestamp=ts)
-
-    md += "## Overview\n\n"
-    md += f"- **Total responses:** {stats['total_responses']}\n"
-    if stats["avg_rating"] is not None:
-        md += f"- **Average rating:** {stats['avg_rating']} / 5\n"
-    else:
-        md += "- **Average rating:** (missing in dataset)\n"
-    md += "\n---\n\n"
-
-    md += "## TL;DR\n\n"
-    md += ai.get("tldr", "(no summary)") + "\n\n"
-
-    md += _render_list("Top Themes", ai.get("themes", []))
-    md += _render_list("Recommended Improvements (Prioritized)", ai.get("improvements", []))
-    md += _render_list("Quick Wins", ai.get("quick_wins", []))
-    md += _render_list("Long-Term Actions", ai.get("long_term", []))
-
-    if guards_note:
-        md += "---\n\n"
-        md += f"**Safety & Guard Rails:** {guards_note}\n"
+    total = stats["total_responses"]
+    avg = stats["avg_rating"]
+    tldr = ai.get("tldr", "(no summary)")
 
+    # Stream each section straight to the file; no intermediate report string
     with open(out_path, "w", encoding="utf-8") as f:
-        f.write(md)
\ No newline at end of file
+        f.write(HEADER.format(timestamp=ts))
+
+        f.write("## Overview\n\n")
+        f.write(f"- **Total responses:** {total}\n")
+        if avg is not None:
+            f.write(f"- **Average rating:** {avg} / 5\n")
+        else:
+            f.write("- **Average rating:** (missing in dataset)\n")
+        f.write("\n---\n\n")
+
+        f.write("## TL;DR\n\n")
+        f.write(tldr + "\n\n")
+
+        f.write(_render_list("Top Themes", ai.get("themes", [])))
+        f.write(_render_list("Recommended Improvements (Prioritized)", ai.get("improvements", [])))
+        f.write(_render_list("Quick Wins", ai.get("quick_wins", [])))
+        f.write(_render_list("Long-Term Actions", ai.get("long_term", [])))
+
+        if guards_note:
+            f.write("---\n\n")
+            f.write(f"**Safety & Guard Rails:** {guards_note}\n")
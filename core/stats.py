@@ -14,13 +14,10 @@ def compute_basic_stats(df: pd.DataFrame, rating_col: str = "rating") -> Dict:
     avg = None
 
     if rating_col in df.columns:
-        def parse_rating(x):
-            try:
-                return float(x)
-            except Exception:
-                return None
-        ratings = [r for r in df[rating_col].map(parse_rating).tolist() if r is not None]
-        avg = round(sum(ratings) / len(ratings), 2) if ratings else None
+        # Unparseable ratings become NaN and are skipped by mean(); the float64
+        # cast folds Arrow-backed NaN/NA into plain NaN so both are skipped
+        ratings = pd.to_numeric(df[rating_col], errors="coerce").astype("float64")
+        avg = round(float(ratings.mean()), 2) if ratings.notna().any() else None
 
     return {
         "total_responses": total,
@@ -29,6 +26,14 @@ def compute_basic_stats(df: pd.DataFrame, rating_col: str = "rating") -> Dict:
         "rating_col": rating_col,
     }
 
+def _newest_index(dates: pd.Series, k: int) -> pd.Index:
+    """Labels of the k newest rows; undated rows follow (NaT last)."""
+    # Partial selection (O(N log k)) instead of sorting everything
+    top = dates.dropna().nlargest(k).index
+    if len(top) < k:
+        top = top.append(dates.index[dates.isna()][: k - len(top)])
+    return top
+
 def sample_feedback_texts(
     df: pd.DataFrame,
     text_col: str = "feedback",
@@ -39,17 +44,24 @@ def sample_feedback_texts(
     Returns up to n feedback texts (newest first if date column exists).
     Drops empty values.
     """
+    texts = df[text_col].dropna()
+    if len(texts) == 0:
+        return []
+
+    dates = None
     if date_col in df.columns:
         try:
-            df = df.copy()
-            df[date_col] = pd.to_datetime(df[date_col], errors="coerce")
-            df = df.sort_values(by=date_col, ascending=False)
+            dates = pd.to_datetime(df[date_col].loc[texts.index], errors="coerce")
         except Exception:
             pass
 
-    s = df[text_col].dropna().astype(str).str.strip()
-    s = s[s != ""]
-    if len(s) == 0:
-        return []
-
-    return s.head(n).tolist()
+    # Order first, then clean only a window of ~n candidates; widen it in the
+    # rare case that blank texts leave fewer than n
+    k = n
+    while True:
+        window = texts.loc[_newest_index(dates, k)] if dates is not None else texts.head(k)
+        s = window.astype(str).str.strip()
+        s = s[s != ""]
+        if len(s) >= n or k >= len(texts):
+            return s.head(n).tolist()
+        k *= 2